@@ -0,0 +1,212 @@
+"""
+Score-change alerts for the G2G screener.
+
+AlertEngine subscribes to scoring results (see score_listeners in app.py) and
+keeps each ticker's last (score, rating) in a dict. Rules are only evaluated
+for tickers whose score or rating changed, and the resulting notifications are
+delivered in batches to a sink on a background thread.
+
+Configuration (environment variables):
+    G2G_ALERT_RULES       Comma separated rules, e.g. "crosses:70,rating" (default)
+    G2G_ALERT_WEBHOOK     URL to POST alert batches to as JSON
+    G2G_ALERT_SMTP_HOST   SMTP server for email alerts (G2G_ALERT_SMTP_PORT, default 25)
+    G2G_ALERT_EMAIL_FROM  Sender address for email alerts
+    G2G_ALERT_EMAIL_TO    Comma separated recipient addresses
+    G2G_ALERT_SMTP_USER / G2G_ALERT_SMTP_PASSWORD  Optional SMTP login (uses STARTTLS)
+"""
+import os
+import queue
+import smtplib
+import threading
+from datetime import datetime
+from email.message import EmailMessage
+
+import requests
+
+
+# ===== RULES =====
+
+class CrossesRule:
+    """Fires when the G2G score moves across a threshold in either direction"""
+
+    def __init__(self, threshold):
+        self.threshold = threshold
+
+    def evaluate(self, ticker, old, new):
+        old_score, new_score = old[0], new[0]
+        if old_score < self.threshold <= new_score:
+            return f"{ticker} crossed above {self.threshold:g}: {old_score:g} → {new_score:g}"
+        if new_score < self.threshold <= old_score:
+            return f"{ticker} fell below {self.threshold:g}: {old_score:g} → {new_score:g}"
+        return None
+
+
+class RatingChangeRule:
+    """Fires when the rating label changes"""
+
+    def evaluate(self, ticker, old, new):
+        if old[1] != new[1]:
+            return f"{ticker} rating changed: {old[1]} → {new[1]}"
+        return None
+
+
+def parse_rules(spec):
+    """Parse a rule spec such as "crosses:70,crosses:40,rating" into rule objects"""
+    rules = []
+    for part in spec.split(','):
+        part = part.strip().lower()
+        if not part:
+            continue
+        name, _, arg = part.partition(':')
+        if name == 'crosses':
+            rules.append(CrossesRule(float(arg)))
+        elif name == 'rating':
+            rules.append(RatingChangeRule())
+        else:
+            raise ValueError(f"Unknown alert rule: {part}")
+    return rules
+
+
+# ===== SINKS =====
+
+class LocalSink:
+    """Keeps delivered batches in memory; stands in for SMTP/webhook when testing"""
+
+    def __init__(self):
+        self.batches = []
+
+    def send(self, notifications):
+        self.batches.append(list(notifications))
+
+
+class WebhookSink:
+    """POSTs each batch as {"alerts": [...]} to a webhook URL"""
+
+    def __init__(self, url, timeout=10):
+        self.url = url
+        self.timeout = timeout
+
+    def send(self, notifications):
+        response = requests.post(self.url, json={"alerts": notifications}, timeout=self.timeout)
+        response.raise_for_status()
+
+
+class SMTPSink:
+    """Sends each batch as a single plain-text email"""
+
+    def __init__(self, host, port, sender, recipients, username=None, password=None, timeout=10):
+        self.host = host
+        self.port = port
+        self.sender = sender
+        self.recipients = recipients
+        self.username = username
+        self.password = password
+        self.timeout = timeout
+
+    def send(self, notifications):
+        msg = EmailMessage()
+        msg['Subject'] = f"G2G Screener: {len(notifications)} score alert(s)"
+        msg['From'] = self.sender
+        msg['To'] = ", ".join(self.recipients)
+        msg.set_content("\n".join(f"[{n['time']}] {n['message']}" for n in notifications))
+
+        with smtplib.SMTP(self.host, self.port, timeout=self.timeout) as smtp:
+            if self.username:
+                smtp.starttls()
+                smtp.login(self.username, self.password)
+            smtp.send_message(msg)
+
+
+# ===== ENGINE =====
+
+class AlertEngine:
+    def __init__(self, rules, sink, batch_size=50):
+        self.rules = rules
+        self.sink = sink
+        self.batch_size = batch_size
+        self._last = {}  # ticker -> (score, rating)
+        self._lock = threading.Lock()
+        self._outbox = queue.Queue()
+        self._worker = None
+
+    def on_results(self, results):
+        """Record a scoring pass and queue alerts for the tickers that changed"""
+        changed = []
+        with self._lock:
+            for result in results:
+                ticker = result['Ticker']
+                current = (result['G2G_Score'], result['Rating'])
+                previous = self._last.get(ticker)
+                if previous == current:
+                    continue
+                self._last[ticker] = current
+                # The first sighting only seeds the index
+                if previous is not None:
+                    changed.append((ticker, previous, current))
+
+        notifications = []
+        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        for ticker, previous, current in changed:
+            for rule in self.rules:
+                message = rule.evaluate(ticker, previous, current)
+                if message:
+                    notifications.append({
+                        "time": now,
+                        "ticker": ticker,
+                        "old_score": previous[0],
+                        "new_score": current[0],
+                        "old_rating": previous[1],
+                        "new_rating": current[1],
+                        "message": message,
+                    })
+
+        for start in range(0, len(notifications), self.batch_size):
+            self._enqueue(notifications[start:start + self.batch_size])
+        return notifications
+
+    def last(self, ticker):
+        """Last (score, rating) seen for ticker, or None"""
+        return self._last.get(ticker)
+
+    def wait(self):
+        """Block until every queued batch has been handed to the sink"""
+        self._outbox.join()
+
+    def _enqueue(self, batch):
+        with self._lock:
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._deliver, name="g2g-alerts", daemon=True)
+                self._worker.start()
+        self._outbox.put(batch)
+
+    def _deliver(self):
+        while True:
+            batch = self._outbox.get()
+            try:
+                self.sink.send(batch)
+            except Exception as e:
+                print(f"Error delivering {len(batch)} alert(s): {e}")
+            finally:
+                self._outbox.task_done()
+
+
+def engine_from_env(environ=os.environ):
+    """Build an AlertEngine from G2G_ALERT_* settings, or None if no sink is configured"""
+    if environ.get('G2G_ALERT_WEBHOOK'):
+        sink = WebhookSink(environ['G2G_ALERT_WEBHOOK'])
+    elif environ.get('G2G_ALERT_SMTP_HOST'):
+        recipients = [r.strip() for r in environ.get('G2G_ALERT_EMAIL_TO', '').split(',') if r.strip()]
+        if not recipients:
+            print("G2G_ALERT_SMTP_HOST is set but G2G_ALERT_EMAIL_TO is empty; email alerts disabled")
+            return None
+        sink = SMTPSink(
+            environ['G2G_ALERT_SMTP_HOST'],
+            int(environ.get('G2G_ALERT_SMTP_PORT', 25)),
+            environ.get('G2G_ALERT_EMAIL_FROM', 'g2g-screener@localhost'),
+            recipients,
+            username=environ.get('G2G_ALERT_SMTP_USER'),
+            password=environ.get('G2G_ALERT_SMTP_PASSWORD'),
+        )
+    else:
+        return None
+    return AlertEngine(parse_rules(environ.get('G2G_ALERT_RULES', 'crosses:70,rating')), sink)
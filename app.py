@@ -1,72 +1,104 @@
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, render_template, request, jsonify, make_response, g, has_request_context
 import pandas as pd
 import yfinance as yf
+import numpy as np
+import functools
+import gzip
+import hashlib
 import json
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+import alerts
+import export
+import live
+from g2g_result import G2GResult, PE_THRESHOLD, PEG_THRESHOLD, UNDERVAL_MULTIPLIER, to_columnar
+
 app = Flask(__name__)
 
 # Initialize default stocks
 default_stocks = ["RELIANCE.NS", "TCS.NS", "INFY.NS", "HDFC.NS", "BAJAJFINSV.NS"]
 
-# Stock Sectors Database
-stock_sectors = {
-    # IT & Technology
-    "TCS.NS": "IT & Technology",
-    "INFY.NS": "IT & Technology",
-    "WIPRO.NS": "IT & Technology",
-    "HCLTECH.NS": "IT & Technology",
-    "LTIM.NS": "IT & Technology",
-    "TECHM.NS": "IT & Technology",
-    
-    # Banking & Financial Services
-    "SBIN.NS": "Banking & Finance",
-    "AXISBANK.NS": "Banking & Finance",
-    "ICICIBANK.NS": "Banking & Finance",
-    "HDFC.NS": "Banking & Finance",
-    
-    # Energy & Oil/Gas
-    "RELIANCE.NS": "Energy & Oil/Gas",
-    "POWERGRID.NS": "Energy & Oil/Gas",
-    "TATASTEEL.NS": "Energy & Oil/Gas",
-    
-    # Automobiles
-    "MARUTI.NS": "Automobiles",
-    "TATAMOTORS.NS": "Automobiles",
-    "BAJAJFINSV.NS": "Automobiles",
-    
-    # Pharmaceuticals & Healthcare
-    "SUNPHARMA.NS": "Pharmaceuticals",
-    "CIPLA.NS": "Pharmaceuticals",
-    "LUPIN.NS": "Pharmaceuticals",
-    
-    # Consumer & FMCG
-    "ITC.NS": "Consumer & FMCG",
-    "ASIANPAINT.NS": "Consumer & FMCG",
-    "NESTLEIND.NS": "Consumer & FMCG",
-    
-    # Telecom
-    "BHARTIARTL.NS": "Telecom",
-    "JIOTELECOM.NS": "Telecom",
-    
-    # Real Estate & Construction
-    "DLF.NS": "Real Estate",
-    "PRESTIGE.NS": "Real Estate",
-    
-    # US Stocks (International)
-    "AAPL": "Technology (US)",
-    "MSFT": "Technology (US)",
-    "GOOGL": "Technology (US)",
-    "AMZN": "Consumer (US)",
-    "TSLA": "Automobiles (US)",
-    "META": "Technology (US)",
-    "NVDA": "Technology (US)",
+# Stock Sectors Database: one row per ticker in sectors.csv, indexed by ticker
+sector_index = pd.read_csv(os.path.join(os.path.dirname(os.path.abspath(__file__)), "sectors.csv"),
+                           index_col="Ticker")["Sector"]
+
+# Indian market universe scanned by the leaders panels
+indian_universe = [t for t in sector_index.index if t.endswith(".NS")]
+
+# Sector-relative scoring: metric -> (score field, points), compared against the sector median
+sector_relative_metrics = {
+    "PE": ("PE_Score", 30),
+    "PEG": ("PEG_Score", 30),
+    "Price_to_Low_Ratio": ("Underval_Score", 40),
 }
+# Status string rewritten for each sector-relative metric: metric -> (status field, label, value format)
+sector_relative_status = {
+    "PE": ("PE_Status", "PE", "{:.2f}"),
+    "PEG": ("PEG_Status", "PEG", "{:.3f}"),
+    "Price_to_Low_Ratio": ("Underval_Status", "Price/52W low", "{:.2f}x"),
+}
+# Sectors with fewer scored peers than this keep the absolute score for that metric
+min_sector_peers = 3
+
+# Callables notified with each batch of fresh g2g_model results
+score_listeners = []
+
+alert_engine = alerts.engine_from_env()
+if alert_engine:
+    score_listeners.append(alert_engine.on_results)
+
+# Score cache: ticker -> (fetched_at, result). Entries older than the TTL are refetched.
+score_cache_ttl = float(os.environ.get('G2G_CACHE_TTL', 300))
+_score_cache = {}
+# ticker -> version, bumped whenever a refetch produces a different result
+_score_versions = {}
+# Failed fetches are never cached; a ticker that just failed is retried after this many seconds
+failure_retry_ttl = float(os.environ.get('G2G_FAILURE_RETRY_TTL', 10))
+_failed_at = {}
+_cache_lock = threading.Lock()
+# Distinguishes ETags issued by this process from those of an earlier run
+_cache_epoch = uuid.uuid4().hex
+
+# Live dashboard deltas: watched tickers are refetched every G2G_LIVE_INTERVAL seconds,
+# regardless of the cache TTL (the refetch also refreshes the shared cache)
+live_hub = live.LiveHub(lambda tickers: score_tickers(tickers, force=True),
+                        interval=float(os.environ.get('G2G_LIVE_INTERVAL', 60)))
+score_listeners.append(live_hub.on_results)
+
+# Startup warm-up: with G2G_WARMUP=1 the watchlist and universe are scored in the
+# background at startup, and /api/ready reports 503 until that has finished
+warmup_concurrency = int(os.environ.get('G2G_WARMUP_CONCURRENCY', 4))
+warmup_attempts = int(os.environ.get('G2G_WARMUP_ATTEMPTS', 3))
+warmup_retry_delay = float(os.environ.get('G2G_WARMUP_RETRY_DELAY', 1))
+_warmup = {"state": "disabled", "done": 0, "total": 0, "failed": [], "started": None, "finished": None}
+_warmup_lock = threading.Lock()
+
+# HTTP responses: bodies smaller than this are sent uncompressed
+min_compress_size = 512
+# Rendered index.html and compressed bodies, keyed by data version
+_page_cache = OrderedDict()
+_compressed_cache = OrderedDict()
+_body_cache_lock = threading.Lock()
+max_cached_bodies = 64
+
+def fetch_info(ticker):
+    """Raw quote/fundamentals dict for ticker; the single upstream call (stubbed by loadtest.py)"""
+    return yf.Ticker(ticker).info
 
 def get_stock_data(ticker):
     try:
-        stock = yf.Ticker(ticker)
-        info = stock.info
+        info = fetch_info(ticker)
         data = {
             "ticker": ticker,
             "price": info.get("currentPrice"),
@@ -93,8 +125,7 @@ def get_screener_eps(stock_id):
 
 def g2g_model(ticker):
     try:
-        stock = yf.Ticker(ticker)
-        info = stock.info
+        info = fetch_info(ticker)
         
         # Extract key metrics with proper null handling
         price = info.get("currentPrice")
@@ -127,87 +158,334 @@ def g2g_model(ticker):
         eps_final = eps_y if (eps_y and eps_y > 0) else None
         
         # ===== METRIC 1: PE VALUATION (30 Points Max) =====
-        pe_threshold = 15
         if pe and pe > 0:
-            pe_val = 1 if pe < pe_threshold else 0
+            pe_val = 1 if pe < PE_THRESHOLD else 0
             pe_score = pe_val * 30
-            pe_status = f"✅ Good (PE: {pe:.2f})" if pe < pe_threshold else f"❌ Expensive (PE: {pe:.2f})"
         else:
             pe_val = 0
             pe_score = 0
-            pe_status = "⚠️ No Data"
         
         # ===== METRIC 2: PEG VALUATION (30 Points Max) =====
         if eps_final and eps_final > 0 and pe and pe > 0:
             peg = pe / (eps_final * 5)
-            peg_threshold = 1.0
-            peg_val = 1 if peg < peg_threshold else 0
+            peg_val = 1 if peg < PEG_THRESHOLD else 0
             peg_score = peg_val * 30
-            peg_status = f"✅ Growth-Adjusted ({peg:.3f})" if peg < peg_threshold else f"❌ Overvalued ({peg:.3f})"
         else:
             peg = None
             peg_val = 0
             peg_score = 0
-            peg_status = "⚠️ Cannot Calculate"
         
         # ===== METRIC 3: 52-WEEK UNDERVALUATION (40 Points Max) =====
         if price and low52 and low52 > 0:
-            underval_threshold = low52 * 1.2
+            underval_threshold = low52 * UNDERVAL_MULTIPLIER
             underval = 1 if price < underval_threshold else 0
             underval_score = underval * 40
             price_to_low = price / low52
-            underval_status = f"✅ Undervalued ({price_to_low:.2f}x)" if price < underval_threshold else f"❌ High ({price_to_low:.2f}x)"
         else:
             underval = 0
             underval_score = 0
             price_to_low = None
-            underval_status = "⚠️ No Data"
         
         # ===== FINAL G2G SCORE =====
         g2g_score = pe_score + peg_score + underval_score
         
-        # Determine rating
-        if g2g_score >= 100:
-            rating = "🟢 Perfect - Strong Buy"
-        elif g2g_score >= 70:
-            rating = "🟡 Very Good - Watchlist"
-        elif g2g_score >= 40:
-            rating = "🟠 Moderate - Hold"
-        elif g2g_score >= 20:
-            rating = "🔴 Poor - Avoid"
-        else:
-            rating = "❌ Very Poor - Avoid"
-        
-        return {
-            "Ticker": ticker,
-            "Price": price,
-            "PE": pe,
-            "PE_Threshold": 15,
-            "PE_Status": pe_status,
-            "EPS_Final": eps_final,
-            "PEG": peg,
-            "PEG_Threshold": 1.0,
-            "PEG_Status": peg_status,
-            "Low52": low52,
-            "High52": high52,
-            "Price_to_Low_Ratio": price_to_low,
-            "Underval_Status": underval_status,
-            "PB_Ratio": pb,
-            "Market_Cap": market_cap,
-            "PE_Score": pe_score,
-            "PE_Score_Max": 30,
-            "PEG_Score": peg_score,
-            "PEG_Score_Max": 30,
-            "Underval_Score": underval_score,
-            "Underval_Score_Max": 40,
-            "G2G_Score": g2g_score,
-            "G2G_Max": 100,
-            "Rating": rating
-        }
+        # Status strings and rating are formatted on access by G2GResult
+        return G2GResult(
+            Ticker=ticker,
+            Price=price,
+            PE=pe,
+            EPS_Final=eps_final,
+            PEG=peg,
+            Low52=low52,
+            High52=high52,
+            Price_to_Low_Ratio=price_to_low,
+            PB_Ratio=pb,
+            Market_Cap=market_cap,
+            PE_Score=pe_score,
+            PEG_Score=peg_score,
+            Underval_Score=underval_score,
+            G2G_Score=g2g_score,
+        )
     except Exception as e:
         print(f"Error analyzing {ticker}: {e}")
         return None
 
+def _score_uncached(ticker):
+    """Fetch and score ticker, labelled with its sector; None if it can't be scored"""
+    try:
+        result = g2g_model(ticker)
+        if result:
+            result['Sector'] = sector_index.get(ticker, "Other")
+        return result
+    except:
+        return None
+
+def cached_score(ticker, force=False):
+    """Return (result, version, changed) for ticker, refetching it when the cache entry is stale
+    (or always, with force=True).
+
+    A failed fetch is not cached: the last good result (if any) is returned as-is,
+    left stale so the next request retries once failure_retry_ttl has passed.
+    """
+    now = time.time()
+    with _cache_lock:
+        entry = _score_cache.get(ticker)
+        if entry and not force and now - entry[0] <= score_cache_ttl:
+            return entry[1], _score_versions[ticker], False
+        failed_at = _failed_at.get(ticker)
+        if failed_at is not None and not force and now - failed_at <= failure_retry_ttl:
+            return (entry[1] if entry else None), _score_versions.get(ticker), False
+    
+    result = _score_uncached(ticker)
+    
+    with _cache_lock:
+        previous = _score_cache.get(ticker)
+        if result is None:
+            _failed_at[ticker] = time.time()
+            return (previous[1] if previous else None), _score_versions.get(ticker), False
+        
+        _failed_at.pop(ticker, None)
+        changed = previous is None or previous[1] != result
+        _score_cache[ticker] = (time.time(), result)
+        if changed:
+            _score_versions[ticker] = _score_versions.get(ticker, 0) + 1
+        return result, _score_versions[ticker], changed
+
+def score_tickers(tickers, force=False):
+    """Score tickers through the cache, labelling each result with its sector.
+
+    Results that changed since the last fetch are published to score_listeners.
+    Cached results are shared, so copy them before modifying.
+    """
+    results = []
+    changed = []
+    versions = {}
+    for ticker in tickers:
+        result, versions[ticker], is_changed = cached_score(ticker, force)
+        if result:
+            results.append(result)
+            if is_changed:
+                changed.append(result)
+    if has_request_context():
+        g.setdefault('data_versions', {}).update(versions)
+    if changed:
+        publish_scores(changed)
+    return results
+
+def score_for_export(tickers):
+    """Like score_tickers, but tickers without a fresh cache entry are scored without
+    being added to the cache, so bulk exports don't grow it to the export's size"""
+    results = []
+    now = time.time()
+    for ticker in tickers:
+        with _cache_lock:
+            entry = _score_cache.get(ticker)
+        if entry and now - entry[0] <= score_cache_ttl:
+            result = entry[1]
+        else:
+            result = _score_uncached(ticker)
+        if result:
+            results.append(result)
+    return results
+
+def start_warmup(concurrency=None):
+    """Prefetch and score default_stocks, then the universe, on a background thread.
+
+    Failed tickers are retried up to warmup_attempts times, then listed under 'failed'.
+    The state always ends as "ready" or "failed", so /api/ready can't stay at 503.
+    """
+    tickers = list(dict.fromkeys(default_stocks + indian_universe))
+    with _warmup_lock:
+        if _warmup['state'] == "warming":
+            return
+        _warmup.update(state="warming", done=0, total=len(tickers), failed=[], started=time.time(), finished=None)
+    
+    def warm(ticker):
+        for attempt in range(max(1, warmup_attempts)):
+            if attempt:
+                time.sleep(warmup_retry_delay * attempt)
+            # Retries bypass the failure retry TTL that the first attempt just set
+            if score_tickers([ticker], force=attempt > 0):
+                with _warmup_lock:
+                    _warmup['done'] += 1
+                return
+        with _warmup_lock:
+            _warmup['failed'].append(ticker)
+    
+    def run():
+        state = "failed"
+        try:
+            # Tickers are submitted in order, so the watchlist is fetched first
+            with ThreadPoolExecutor(max_workers=concurrency or warmup_concurrency) as pool:
+                list(pool.map(warm, tickers))
+            state = "ready"
+        except Exception as e:
+            print(f"Warm-up failed: {e}")
+        finally:
+            with _warmup_lock:
+                _warmup.update(state=state, finished=time.time())
+                status = dict(_warmup)
+        print(f"Warm-up {state}: {status['done']}/{status['total']} tickers scored, "
+              f"{len(status['failed'])} failed, in {status['finished'] - status['started']:.1f}s")
+    
+    threading.Thread(target=run, name="g2g-warmup", daemon=True).start()
+
+def publish_scores(results):
+    for listener in score_listeners:
+        try:
+            listener(results)
+        except Exception as e:
+            print(f"Error in score listener: {e}")
+
+def apply_sector_relative(results):
+    """Re-score results against their sector's median PE, PEG and price-to-52W-low ratio.
+
+    All sector statistics come from a single groupby over the whole result set, so
+    ranking a universe this way costs about the same as the absolute scores.
+    """
+    if not results:
+        return results
+    
+    results = [r.copy() for r in results]
+    metrics = list(sector_relative_metrics)
+    df = pd.DataFrame({col: [r[col] for r in results] for col in metrics})
+    df = df.astype(float)
+    grouped = df.groupby(pd.Series([r['Sector'] for r in results]))
+    medians = grouped.transform("median")
+    pctiles = grouped.rank(pct=True)
+    peers = grouped.transform("count")
+    
+    scores = pd.DataFrame(index=df.index)
+    for metric, (score_field, points) in sector_relative_metrics.items():
+        absolute = [r[score_field] for r in results]
+        relative = np.where(df[metric] < medians[metric], points, 0)
+        scores[score_field] = np.where(peers[metric] >= min_sector_peers, relative, absolute)
+        scores[f"{metric}_Sector_Median"] = medians[metric]
+        scores[f"{metric}_Sector_Pctile"] = pctiles[metric]
+    scores["G2G_Score"] = scores[[field for field, _ in sector_relative_metrics.values()]].sum(axis=1)
+    scores["Sector_Peers"] = peers.max(axis=1)
+    
+    scores = scores.astype(object).where(scores.notna(), None)
+    relative_metrics = (peers >= min_sector_peers).to_dict('records')
+    for result, row, relative in zip(results, scores.to_dict('records'), relative_metrics):
+        result.update(row)
+        # Status strings follow the score: sector-relative wherever the score is
+        for metric, (status_field, label, value_format) in sector_relative_status.items():
+            if relative[metric]:
+                result[status_field] = sector_status(result[metric], row[f"{metric}_Sector_Median"],
+                                                     label, value_format)
+        result['Scoring_Mode'] = "sector"
+    return results
+
+def sector_status(value, median, label, value_format):
+    if value is None:
+        return "⚠️ No Data"
+    comparison = f"({label} {value_format.format(value)} vs {value_format.format(median)})"
+    if value < median:
+        return f"✅ Below sector median {comparison}"
+    return f"❌ Not below sector median {comparison}"
+
+def data_updated(tickers):
+    """Time the oldest cached result for tickers was fetched (now if any is missing)"""
+    with _cache_lock:
+        fetched = [_score_cache[t][0] for t in tickers if t in _score_cache]
+    if len(fetched) < len(tickers):
+        return datetime.now()
+    return datetime.fromtimestamp(min(fetched, default=time.time()))
+
+def data_etag(tickers, versions=None):
+    """ETag for the request URL and the data versions of tickers.
+
+    Without explicit versions the cache is consulted, and None is returned if any
+    ticker is missing or stale, since the current data is then unknown.
+    """
+    if versions is None:
+        versions = {}
+        now = time.time()
+        with _cache_lock:
+            for ticker in tickers:
+                entry = _score_cache.get(ticker)
+                if entry is None or now - entry[0] > score_cache_ttl:
+                    return None
+                versions[ticker] = _score_versions[ticker]
+    parts = [_cache_epoch, request.full_path] + [f"{t}:{versions.get(t)}" for t in tickers]
+    return hashlib.sha1("|".join(parts).encode()).hexdigest()
+
+def conditional(scope):
+    """Serve a GET view with an ETag tied to the data versions of scope()'s tickers.
+
+    If every ticker is cached and fresh and the client already holds that ETag,
+    answer 304 without running the view (no scoring, no serialization).
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            tickers = scope()
+            etag = data_etag(tickers)
+            if etag and request.if_none_match.contains_weak(etag):
+                response = app.response_class(status=304)
+            else:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+                etag = data_etag(tickers, g.get('data_versions'))
+            response.set_etag(etag, weak=True)
+            response.headers['Cache-Control'] = 'no-cache'
+            response.vary.add('Accept-Encoding')
+            return response
+        return wrapper
+    return decorator
+
+def remember(cache, key, value):
+    with _body_cache_lock:
+        cache[key] = value
+        cache.move_to_end(key)
+        while len(cache) > max_cached_bodies:
+            cache.popitem(last=False)
+
+@app.after_request
+def compress_response(response):
+    """gzip/brotli-compress sizeable responses, reusing bodies already compressed for the same ETag.
+
+    HEAD responses are compressed too, so their Content-Length and Content-Encoding match GET.
+    """
+    if (response.status_code != 200 or response.direct_passthrough or response.is_streamed
+            or 'Content-Encoding' in response.headers):
+        return response
+    
+    accept = request.accept_encodings
+    if brotli and accept['br']:
+        encoding, compress = 'br', lambda data: brotli.compress(data, quality=5)
+    elif accept['gzip']:
+        encoding, compress = 'gzip', lambda data: gzip.compress(data, compresslevel=6)
+    else:
+        return response
+    
+    etag, weak = response.get_etag()
+    key = (etag, encoding)
+    body = _compressed_cache.get(key) if etag else None
+    if body is None:
+        data = response.get_data()
+        if len(data) < min_compress_size:
+            return response
+        body = compress(data)
+        if etag:
+            remember(_compressed_cache, key, body)
+    
+    response.set_data(body)
+    response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+    return response
+
+def sorted_by_score(results):
+    return sorted(results, key=lambda x: x['G2G_Score'], reverse=True)
+
+def results_response(results):
+    """JSON list of result rows, or one array per field with ?format=columnar"""
+    if request.args.get('format') == 'columnar':
+        return jsonify(to_columnar(results))
+    return jsonify([r.to_dict() for r in results])
+
 def get_score_rating(score):
     if score >= 80:
         return ("🟢 Strong Buy", "#00aa00")
@@ -221,21 +499,20 @@ def get_score_rating(score):
         return ("❌ Avoid", "#990000")
 
 @app.route('/')
+@conditional(lambda: default_stocks)
 def index():
-    results = []
-    for ticker in default_stocks:
-        result = g2g_model(ticker)
-        if result:
-            results.append(result)
-    
-    results_df = pd.DataFrame(results).sort_values("G2G_Score", ascending=False)
-    results_html = results_df.to_html(classes='table table-striped table-bordered', index=False)
-    
-    return render_template('index.html', 
-                         results=results_df.to_dict('records'),
-                         results_html=results_html,
-                         stocks=default_stocks,
-                         updated=datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+    results = sorted_by_score(score_tickers(default_stocks))
+    
+    # Rendered page is reused for as long as the underlying data is unchanged
+    version = data_etag(default_stocks, g.get('data_versions'))
+    page = _page_cache.get(version)
+    if page is None:
+        page = render_template('index.html', 
+                             results=[r.to_dict() for r in results],
+                             stocks=default_stocks,
+                             updated=data_updated(default_stocks).strftime("%Y-%m-%d %H:%M:%S"))
+        remember(_page_cache, version, page)
+    return page
 
 @app.route('/api/add-stock', methods=['POST'])
 def add_stock():
@@ -246,11 +523,12 @@ def add_stock():
         return jsonify({"success": False, "message": "Invalid ticker"}), 400
     
     try:
-        result = g2g_model(ticker)
+        results = score_tickers([ticker])
+        result = results[0] if results else None
     except Exception as e:
         # Return the exception message to help debugging client-side
         try:
-            info = yf.Ticker(ticker).info
+            info = fetch_info(ticker)
         except Exception:
             info = None
         return jsonify({"success": False, "message": "Exception during analysis", "error": str(e), "info": info}), 500
@@ -258,7 +536,7 @@ def add_stock():
     if not result:
         # Try to include raw info to help diagnose missing data
         try:
-            info = yf.Ticker(ticker).info
+            info = fetch_info(ticker)
         except Exception:
             info = None
         return jsonify({"success": False, "message": "Could not fetch data for ticker", "info": info}), 400
@@ -272,7 +550,7 @@ def add_stock():
     if ticker not in stocks_list:
         stocks_list.append(ticker)
     
-    return jsonify({"success": True, "result": result, "stocks": stocks_list})
+    return jsonify({"success": True, "result": result.to_dict(), "stocks": stocks_list})
 
 @app.route('/api/remove-stock', methods=['POST'])
 def remove_stock():
@@ -310,21 +588,63 @@ def ticker_suggestions():
     suggestions = [s for s in all_stocks if query in s][:10]
     return jsonify(suggestions)
 
+def requested_tickers():
+    tickers = [t.strip().upper() for t in request.args.get('tickers', '').split(',')]
+    return [t for t in tickers if t]
+
 @app.route('/api/analyze', methods=['GET'])
+@conditional(requested_tickers)
 def analyze():
-    tickers = request.args.get('tickers', '').split(',')
-    results = []
-    
-    for ticker in tickers:
-        ticker = ticker.strip().upper()
-        if ticker:
-            result = g2g_model(ticker)
-            if result:
-                results.append(result)
+    results = score_tickers(requested_tickers())
     
-    results_df = pd.DataFrame(results).sort_values("G2G_Score", ascending=False)
-    return jsonify(results_df.to_dict('records'))
+    return results_response(sorted_by_score(results))
+
+
+@app.route('/api/stream', methods=['GET'])
+def stream():
+    """Server-Sent Events: pushes changed fields for ?tickers= (default watchlist) as they refresh"""
+    sub = live_hub.subscribe(requested_tickers() or default_stocks)
+    response = app.response_class(live_hub.stream(sub), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+@app.route('/api/ready', methods=['GET'])
+def ready():
+    """Readiness probe: 503 while the startup warm-up is still running (200 once it is ready or failed)"""
+    with _warmup_lock:
+        status = dict(_warmup, failed=list(_warmup['failed']))
+    is_ready = status['state'] != "warming"
+    return jsonify({"ready": is_ready, **status}), 200 if is_ready else 503
 
+@app.route('/api/export', methods=['GET'])
+def export_scores():
+    """Stream scores as ?format=csv|parquet|xlsx for ?tickers=... or ?scope=universe|watchlist"""
+    fmt = request.args.get('format', 'csv')
+    try:
+        export.check_format(fmt)
+    except ValueError as e:
+        return jsonify({"success": False, "message": str(e)}), 400
+    except RuntimeError as e:
+        return jsonify({"success": False, "message": str(e)}), 501
+    
+    scope = request.args.get('scope')
+    if scope == 'universe':
+        tickers = list(indian_universe)
+    elif scope == 'watchlist':
+        tickers = list(default_stocks)
+    else:
+        tickers = requested_tickers()
+    if not tickers:
+        return jsonify({"success": False, "message": "No tickers provided"}), 400
+    
+    chunk_size = max(1, min(request.args.get('chunk', export.DEFAULT_CHUNK_SIZE, type=int), 1000))
+    mimetype, extension = export.FORMATS[fmt]
+    body = export.export(export.scored_rows(tickers, score_for_export, chunk_size), fmt)
+    response = app.response_class(body, mimetype=mimetype)
+    response.headers['Content-Disposition'] = (
+        f'attachment; filename="g2g_scores_{datetime.now():%Y%m%d_%H%M%S}.{extension}"')
+    return response
 
 @app.route('/api/check-ticker', methods=['GET'])
 def check_ticker():
@@ -334,8 +654,7 @@ def check_ticker():
         return jsonify({"success": False, "message": "No ticker provided"}), 400
 
     try:
-        stock = yf.Ticker(ticker)
-        info = stock.info
+        info = fetch_info(ticker)
     except Exception as e:
         return jsonify({"success": False, "message": "yfinance error", "error": str(e)}), 500
 
@@ -344,76 +663,49 @@ def check_ticker():
     except Exception as e:
         analysis = None
 
-    return jsonify({"success": True, "ticker": ticker, "info": info, "analysis": analysis})
+    return jsonify({"success": True, "ticker": ticker, "info": info,
+                    "analysis": analysis.to_dict() if analysis else None})
 
 @app.route('/api/sector-leaders', methods=['GET'])
+@conditional(lambda: indian_universe)
 def sector_leaders():
-    """Get top performing companies in Indian market by sector based on G2G model"""
-    
-    # Comprehensive list of Indian stocks by sector
-    sector_stocks_map = {
-        "IT & Technology": ["TCS.NS", "INFY.NS", "WIPRO.NS", "HCLTECH.NS", "LTIM.NS", "TECHM.NS"],
-        "Banking & Finance": ["SBIN.NS", "AXISBANK.NS", "ICICIBANK.NS", "HDFC.NS", "KOTAKBANK.NS", "INDUSIND.NS"],
-        "Energy & Oil/Gas": ["RELIANCE.NS", "POWERGRID.NS", "TATASTEEL.NS", "IOCL.NS"],
-        "Automobiles": ["MARUTI.NS", "TATAMOTORS.NS", "BAJAJFINSV.NS", "EICHER.NS", "ASHOKLEYLAND.NS"],
-        "Pharmaceuticals": ["SUNPHARMA.NS", "CIPLA.NS", "LUPIN.NS", "DIVISLAB.NS", "BIOCON.NS"],
-        "Consumer & FMCG": ["ITC.NS", "ASIANPAINT.NS", "NESTLEIND.NS", "BRITANNIA.NS", "MARICO.NS"],
-        "Telecom": ["BHARTIARTL.NS", "IDEA.NS", "VODAFONE.NS"],
-        "Real Estate": ["DLF.NS", "PRESTIGE.NS", "LODHA.NS", "ADANIPORTS.NS"],
-        "Utilities": ["POWERGRID.NS", "NIITTECH.NS"],
-    }
-    
-    sector_results = {}
-    
-    for sector, tickers in sector_stocks_map.items():
-        sector_results[sector] = []
-        
-        for ticker in tickers:
-            try:
-                result = g2g_model(ticker)
-                if result:
-                    result['Sector'] = sector
-                    sector_results[sector].append(result)
-            except:
-                pass
-        
-        # Sort by G2G Score and get top 3
-        if sector_results[sector]:
-            sector_results[sector].sort(key=lambda x: x['G2G_Score'], reverse=True)
-            sector_results[sector] = sector_results[sector][:3]
-    
-    return jsonify(sector_results)
+    """Get top performing companies in Indian market by sector based on G2G model.
+
+    Pass ?mode=sector to rank on scores relative to each sector's medians.
+    With ?format=columnar the leaders come back as one table with a Sector column.
+    """
+    results = score_tickers(indian_universe)
+    if request.args.get('mode') == 'sector':
+        results = apply_sector_relative(results)
+    
+    sector_results = {sector: [] for sector in sector_index[indian_universe].unique()}
+    for result in results:
+        sector_results[result['Sector']].append(result)
+    
+    # Sort by G2G Score and get top 3
+    for sector, sector_stocks in sector_results.items():
+        sector_results[sector] = sorted_by_score(sector_stocks)[:3]
+    
+    if request.args.get('format') == 'columnar':
+        return results_response([r for leaders in sector_results.values() for r in leaders])
+    return jsonify({sector: [r.to_dict() for r in leaders] for sector, leaders in sector_results.items()})
 
 @app.route('/api/top-performers', methods=['GET'])
+@conditional(lambda: indian_universe)
 def top_performers():
-    """Get overall top 10 performing companies in Indian market"""
-    
-    all_indian_stocks = [
-        "TCS.NS", "INFY.NS", "WIPRO.NS", "HCLTECH.NS", "LTIM.NS", "TECHM.NS",
-        "SBIN.NS", "AXISBANK.NS", "ICICIBANK.NS", "HDFC.NS", "KOTAKBANK.NS", "INDUSIND.NS",
-        "RELIANCE.NS", "POWERGRID.NS", "TATASTEEL.NS", "IOCL.NS",
-        "MARUTI.NS", "TATAMOTORS.NS", "BAJAJFINSV.NS", "EICHER.NS", "ASHOKLEYLAND.NS",
-        "SUNPHARMA.NS", "CIPLA.NS", "LUPIN.NS", "DIVISLAB.NS", "BIOCON.NS",
-        "ITC.NS", "ASIANPAINT.NS", "NESTLEIND.NS", "BRITANNIA.NS", "MARICO.NS",
-        "BHARTIARTL.NS", "IDEA.NS", "VODAFONE.NS",
-        "DLF.NS", "PRESTIGE.NS", "LODHA.NS", "ADANIPORTS.NS"
-    ]
-    
-    results = []
-    
-    for ticker in all_indian_stocks:
-        try:
-            result = g2g_model(ticker)
-            if result:
-                sector = stock_sectors.get(ticker, "Other")
-                result['Sector'] = sector
-                results.append(result)
-        except:
-            pass
+    """Get overall top performing companies in Indian market.
+
+    Pass ?mode=sector to rank on scores relative to each sector's medians.
+    """
+    results = score_tickers(indian_universe)
+    if request.args.get('mode') == 'sector':
+        results = apply_sector_relative(results)
     
     # Sort by G2G Score and return top 15
-    results.sort(key=lambda x: x['G2G_Score'], reverse=True)
-    return jsonify(results[:15])
+    return results_response(sorted_by_score(results)[:15])
+
+if os.environ.get('G2G_WARMUP', '').lower() in ('1', 'true', 'yes'):
+    start_warmup()
 
 if __name__ == '__main__':
     app.run(debug=False, port=5000, host='0.0.0.0')
@@ -0,0 +1,260 @@
+#!/usr/bin/env python
+"""
+Streaming export of scored tickers to CSV, Parquet and Excel.
+
+Rows come from the scoring pipeline in chunks. Each chunk is written out
+before the next one is scored, so memory stays bounded by the chunk size
+instead of the number of tickers:
+
+  - CSV: the header is sent straight away, then the rows of each chunk.
+  - Parquet: each chunk becomes one row group, and its bytes are sent when written.
+  - xlsx: rows go to openpyxl's write-only workbook, which keeps them in a temp
+    file. An xlsx file is a zip archive, so its bytes can only be sent once the
+    last row is written.
+
+Parquet needs the optional pyarrow package, and xlsx needs openpyxl.
+
+Examples:
+    python export.py --universe --format csv --out universe.csv
+    python export.py --tickers-file nse_all.txt --format parquet --out scan.parquet
+    python export.py --from-csv universe.csv --format xlsx --out universe.xlsx
+"""
+import argparse
+import contextlib
+import csv
+import io
+import itertools
+import os
+import sys
+import tempfile
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+try:
+    from openpyxl import Workbook
+except ImportError:
+    Workbook = None
+
+from g2g_result import ROW_FIELDS
+
+EXPORT_FIELDS = ROW_FIELDS + ("Sector",)
+
+_TEXT_FIELDS = {"Ticker", "PE_Status", "PEG_Status", "Underval_Status", "Rating", "Sector"}
+_INT_FIELDS = {"PE_Threshold", "PE_Score", "PE_Score_Max", "PEG_Score", "PEG_Score_Max",
+               "Underval_Score", "Underval_Score_Max", "G2G_Score", "G2G_Max"}
+
+FORMATS = {
+    "csv": ("text/csv", "csv"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+    "xlsx": ("application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", "xlsx"),
+}
+
+DEFAULT_CHUNK_SIZE = 50
+
+
+# ===== ROW SOURCES =====
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def scored_rows(tickers, score, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Score tickers chunk by chunk with score(list_of_tickers), yielding lists of row tuples"""
+    for chunk in chunked(tickers, chunk_size):
+        yield [tuple(r[field] for field in EXPORT_FIELDS) for r in score(chunk)]
+
+
+def csv_rows(path, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Read a previous CSV export back as typed row tuples, chunk by chunk"""
+    with open(path, newline='', encoding='utf-8') as f:
+        for chunk in chunked(csv.DictReader(f), chunk_size):
+            yield [tuple(_parse(field, row.get(field)) for field in EXPORT_FIELDS) for row in chunk]
+
+
+def _parse(field, value):
+    if value is None or value == '':
+        return None
+    if field in _TEXT_FIELDS:
+        return value
+    number = float(value)
+    return int(number) if field in _INT_FIELDS else number
+
+
+# ===== WRITERS =====
+# Each writer takes an iterable of row-tuple chunks and yields bytes as soon as they are ready.
+
+def write_csv(chunks):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_FIELDS)
+    yield _drain_text(buffer)
+    for rows in chunks:
+        writer.writerows(rows)
+        yield _drain_text(buffer)
+
+
+def _drain_text(buffer):
+    data = buffer.getvalue().encode('utf-8')
+    buffer.seek(0)
+    buffer.truncate()
+    return data
+
+
+class _ByteSink:
+    """Write-only file object that hands back whatever has been written since the last drain"""
+
+    def __init__(self):
+        self._parts = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data):
+        self._parts.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self):
+        data, self._parts = b"".join(self._parts), []
+        return data
+
+
+def parquet_schema():
+    def field_type(field):
+        if field in _TEXT_FIELDS:
+            return pa.string()
+        return pa.int64() if field in _INT_FIELDS else pa.float64()
+    return pa.schema([(field, field_type(field)) for field in EXPORT_FIELDS])
+
+
+def write_parquet(chunks):
+    if pa is None:
+        raise RuntimeError("Parquet export requires pyarrow (pip install pyarrow)")
+    schema = parquet_schema()
+    sink = _ByteSink()
+    writer = pq.ParquetWriter(sink, schema)
+    try:
+        for rows in chunks:
+            if not rows:
+                continue
+            columns = list(zip(*rows))
+            writer.write_table(pa.Table.from_arrays(
+                [pa.array(column, type=schema.field(i).type) for i, column in enumerate(columns)], schema=schema))
+            yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+def write_xlsx(chunks, read_size=64 * 1024):
+    if Workbook is None:
+        raise RuntimeError("Excel export requires openpyxl (pip install openpyxl)")
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("G2G Scores")
+    sheet.append(EXPORT_FIELDS)
+    for rows in chunks:
+        for row in rows:
+            sheet.append(row)
+
+    with tempfile.TemporaryFile() as f:
+        workbook.save(f)
+        f.seek(0)
+        while True:
+            data = f.read(read_size)
+            if not data:
+                break
+            yield data
+
+
+WRITERS = {"csv": write_csv, "parquet": write_parquet, "xlsx": write_xlsx}
+
+
+def check_format(fmt):
+    """Raise ValueError/RuntimeError up front if fmt can't be written here"""
+    if fmt not in WRITERS:
+        raise ValueError(f"Unknown export format '{fmt}' (choose from {', '.join(WRITERS)})")
+    if fmt == "parquet" and pa is None:
+        raise RuntimeError("Parquet export requires pyarrow (pip install pyarrow)")
+    if fmt == "xlsx" and Workbook is None:
+        raise RuntimeError("Excel export requires openpyxl (pip install openpyxl)")
+
+
+def export(chunks, fmt):
+    """Bytes generator writing row chunks in the given format"""
+    check_format(fmt)
+    return WRITERS[fmt](chunks)
+
+
+# ===== CLI =====
+
+def _ticker_lines(path):
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            for ticker in line.replace(',', ' ').split():
+                yield ticker.strip().upper()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Stream G2G scores to CSV, Parquet or Excel")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--tickers", help="comma separated tickers to score")
+    source.add_argument("--tickers-file", help="file of tickers (one per line or comma/space separated), read lazily")
+    source.add_argument("--universe", action="store_true", help="score the configured Indian universe")
+    source.add_argument("--from-csv", help="re-export a previous CSV export without rescoring")
+    parser.add_argument("--format", choices=sorted(WRITERS), default="csv")
+    parser.add_argument("--out", help="output file (default: stdout)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                        help=f"tickers scored per chunk / Parquet row group (default {DEFAULT_CHUNK_SIZE})")
+    args = parser.parse_args(argv)
+
+    try:
+        check_format(args.format)
+    except (ValueError, RuntimeError) as e:
+        parser.error(str(e))
+
+    if args.from_csv:
+        chunks = csv_rows(args.from_csv, args.chunk_size)
+    else:
+        # Importing app runs its startup code; a one-off export has no use for the
+        # background warm-up, which would only race the export for the same tickers
+        os.environ.pop('G2G_WARMUP', None)
+        import app as g2g_app
+        if args.tickers:
+            tickers = [t.strip().upper() for t in args.tickers.split(',') if t.strip()]
+        elif args.tickers_file:
+            tickers = _ticker_lines(args.tickers_file)
+        else:
+            tickers = g2g_app.indian_universe
+        chunks = scored_rows(tickers, g2g_app.score_for_export, args.chunk_size)
+
+    out = open(args.out, 'wb') if args.out else sys.stdout.buffer
+    try:
+        # Keep the app's diagnostic prints out of the exported data
+        with contextlib.redirect_stdout(sys.stderr):
+            for data in export(chunks, args.format):
+                out.write(data)
+                out.flush()
+    finally:
+        if args.out:
+            out.close()
+
+
+if __name__ == '__main__':
+    main()
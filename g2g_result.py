@@ -0,0 +1,191 @@
+"""
+Compact result record for the G2G model.
+
+G2GResult stores the measured values and scores in __slots__. The constant
+thresholds/maxima live once in CONSTANTS, and the emoji status strings and
+rating are only formatted when someone reads them. Results still behave like
+the old dicts for reading and writing (result['PE_Score'], result['Sector'] = ...),
+and to_dict() produces the full per-row record for JSON responses.
+"""
+
+PE_THRESHOLD = 15
+PEG_THRESHOLD = 1.0
+UNDERVAL_MULTIPLIER = 1.2
+
+CONSTANTS = {
+    "PE_Threshold": PE_THRESHOLD,
+    "PEG_Threshold": PEG_THRESHOLD,
+    "PE_Score_Max": 30,
+    "PEG_Score_Max": 30,
+    "Underval_Score_Max": 40,
+    "G2G_Max": 100,
+}
+
+# Per-ticker values held by each result, in slot order
+VALUE_FIELDS = (
+    "Ticker", "Price", "PE", "EPS_Final", "PEG", "Low52", "High52",
+    "Price_to_Low_Ratio", "PB_Ratio", "Market_Cap",
+    "PE_Score", "PEG_Score", "Underval_Score", "G2G_Score", "Sector",
+)
+
+# Field order of the row format (matches the original g2g_model dict)
+ROW_FIELDS = (
+    "Ticker", "Price", "PE", "PE_Threshold", "PE_Status", "EPS_Final",
+    "PEG", "PEG_Threshold", "PEG_Status", "Low52", "High52",
+    "Price_to_Low_Ratio", "Underval_Status", "PB_Ratio", "Market_Cap",
+    "PE_Score", "PE_Score_Max", "PEG_Score", "PEG_Score_Max",
+    "Underval_Score", "Underval_Score_Max", "G2G_Score", "G2G_Max", "Rating",
+)
+
+# Display strings that may be replaced per result (sector-relative scoring does this)
+STATUS_FIELDS = ("PE_Status", "PEG_Status", "Underval_Status")
+
+# Columns sent by the columnar format; status strings are left to the client unless overridden
+COLUMNAR_FIELDS = VALUE_FIELDS + ("Rating",)
+
+
+def g2g_rating(g2g_score):
+    if g2g_score >= 100:
+        return "🟢 Perfect - Strong Buy"
+    elif g2g_score >= 70:
+        return "🟡 Very Good - Watchlist"
+    elif g2g_score >= 40:
+        return "🟠 Moderate - Hold"
+    elif g2g_score >= 20:
+        return "🔴 Poor - Avoid"
+    else:
+        return "❌ Very Poor - Avoid"
+
+
+class G2GResult:
+    __slots__ = VALUE_FIELDS + ("extra",)
+
+    def __init__(self, **values):
+        for field in VALUE_FIELDS:
+            setattr(self, field, values.pop(field, None))
+        # Fields added after scoring (e.g. sector-relative statistics)
+        self.extra = values or None
+
+    # ===== LAZY DISPLAY STRINGS =====
+
+    def _status_override(self, field):
+        return self.extra.get(field) if self.extra else None
+
+    @property
+    def PE_Status(self):
+        override = self._status_override("PE_Status")
+        if override:
+            return override
+        if self.PE and self.PE > 0:
+            if self.PE < PE_THRESHOLD:
+                return f"✅ Good (PE: {self.PE:.2f})"
+            return f"❌ Expensive (PE: {self.PE:.2f})"
+        return "⚠️ No Data"
+
+    @property
+    def PEG_Status(self):
+        override = self._status_override("PEG_Status")
+        if override:
+            return override
+        if self.PEG is not None:
+            if self.PEG < PEG_THRESHOLD:
+                return f"✅ Growth-Adjusted ({self.PEG:.3f})"
+            return f"❌ Overvalued ({self.PEG:.3f})"
+        return "⚠️ Cannot Calculate"
+
+    @property
+    def Underval_Status(self):
+        override = self._status_override("Underval_Status")
+        if override:
+            return override
+        if self.Price_to_Low_Ratio is not None:
+            if self.Price < self.Low52 * UNDERVAL_MULTIPLIER:
+                return f"✅ Undervalued ({self.Price_to_Low_Ratio:.2f}x)"
+            return f"❌ High ({self.Price_to_Low_Ratio:.2f}x)"
+        return "⚠️ No Data"
+
+    @property
+    def Rating(self):
+        return g2g_rating(self.G2G_Score)
+
+    # ===== DICT-STYLE ACCESS =====
+
+    def __getitem__(self, key):
+        if key in CONSTANTS:
+            return CONSTANTS[key]
+        if key in ROW_FIELDS or key in VALUE_FIELDS:
+            return getattr(self, key)
+        if self.extra and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if key in VALUE_FIELDS:
+            setattr(self, key, value)
+        elif key in ROW_FIELDS and key not in STATUS_FIELDS:
+            raise KeyError(f"{key} is derived and cannot be set")
+        else:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[key] = value
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def update(self, values):
+        for key, value in values.items():
+            self[key] = value
+
+    def to_dict(self):
+        row = {field: self[field] for field in ROW_FIELDS}
+        if self.Sector is not None:
+            row["Sector"] = self.Sector
+        if self.extra:
+            row.update(self.extra)
+        return row
+
+    def copy(self):
+        values = {field: getattr(self, field) for field in VALUE_FIELDS}
+        values.update(self.extra or {})
+        return G2GResult(**values)
+
+    def __eq__(self, other):
+        if not isinstance(other, G2GResult):
+            return NotImplemented
+        return (all(getattr(self, f) == getattr(other, f) for f in VALUE_FIELDS)
+                and (self.extra or {}) == (other.extra or {}))
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"G2GResult({self.Ticker!r}, G2G_Score={self.G2G_Score!r})"
+
+
+def to_columnar(results):
+    """Encode results as {constants, columns: {field: [values...]}}, one array per field.
+
+    A status column is only sent when some result overrides it, since the client can't
+    derive those strings from the values and the constants.
+    """
+    columns = {field: [getattr(r, field) for r in results] for field in COLUMNAR_FIELDS}
+    for field in STATUS_FIELDS:
+        if any(r._status_override(field) for r in results):
+            columns[field] = [getattr(r, field) for r in results]
+
+    extra_fields = []
+    for r in results:
+        for key in (r.extra or ()):
+            if key not in columns and key not in extra_fields and key not in STATUS_FIELDS:
+                extra_fields.append(key)
+    for key in extra_fields:
+        columns[key] = [(r.extra or {}).get(key) for r in results]
+
+    return {
+        "format": "columnar",
+        "constants": CONSTANTS,
+        "count": len(results),
+        "columns": columns,
+    }
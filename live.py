@@ -0,0 +1,116 @@
+"""
+Live score/price deltas for the web dashboard over Server-Sent Events.
+
+LiveHub subscribes to scoring results (see score_listeners in app.py). For each
+result it works out which display fields changed since the last push and hands
+only those to the clients watching that ticker. A single background thread
+refreshes the union of watched tickers, so N open dashboards cost one fetch per
+ticker per refresh instead of N full reloads.
+"""
+import json
+import threading
+import time
+
+# Row fields pushed to clients when they change
+LIVE_FIELDS = (
+    "Price", "PE", "PE_Status", "EPS_Final", "PEG", "PEG_Status",
+    "Low52", "High52", "Price_to_Low_Ratio", "Underval_Status",
+    "PE_Score", "PEG_Score", "Underval_Score", "G2G_Score", "Rating",
+)
+
+
+class Subscription:
+    """One connected client. Pending deltas are merged per ticker, so a slow
+    client holds at most one entry per watched ticker."""
+
+    def __init__(self, tickers):
+        self.tickers = frozenset(tickers)
+        self._pending = {}
+        self._cond = threading.Condition()
+
+    def push(self, delta):
+        with self._cond:
+            self._pending.setdefault(delta["Ticker"], {}).update(delta)
+            self._cond.notify()
+
+    def take(self, timeout):
+        """Wait up to timeout seconds and return the pending deltas (possibly empty)"""
+        with self._cond:
+            if not self._pending:
+                self._cond.wait(timeout)
+            deltas, self._pending = list(self._pending.values()), {}
+        return deltas
+
+
+class LiveHub:
+    def __init__(self, refresh, interval=60, heartbeat=15):
+        self.refresh = refresh
+        self.interval = interval
+        self.heartbeat = heartbeat
+        self._last = {}  # ticker -> {field: value} as last pushed
+        self._by_ticker = {}  # ticker -> set of subscriptions
+        self._lock = threading.Lock()
+        self._refresher = None
+
+    def subscribe(self, tickers):
+        sub = Subscription(tickers)
+        with self._lock:
+            for ticker in sub.tickers:
+                self._by_ticker.setdefault(ticker, set()).add(sub)
+            if self._refresher is None:
+                self._refresher = threading.Thread(target=self._refresh_loop, name="g2g-live", daemon=True)
+                self._refresher.start()
+        return sub
+
+    def unsubscribe(self, sub):
+        with self._lock:
+            for ticker in sub.tickers:
+                watchers = self._by_ticker.get(ticker)
+                if watchers:
+                    watchers.discard(sub)
+                    if not watchers:
+                        del self._by_ticker[ticker]
+
+    def watched(self):
+        with self._lock:
+            return list(self._by_ticker)
+
+    def on_results(self, results):
+        """Push changed fields of each result to the clients watching its ticker"""
+        for result in results:
+            ticker = result['Ticker']
+            current = {field: result[field] for field in LIVE_FIELDS}
+            with self._lock:
+                previous = self._last.get(ticker, {})
+                self._last[ticker] = current
+                watchers = list(self._by_ticker.get(ticker, ()))
+            delta = {field: value for field, value in current.items() if previous.get(field) != value}
+            if not delta or not watchers:
+                continue
+            delta["Ticker"] = ticker
+            for sub in watchers:
+                sub.push(delta)
+
+    def stream(self, sub):
+        """SSE event generator for one client; unsubscribes when the client goes away"""
+        try:
+            yield "retry: 5000\n\n"
+            while True:
+                deltas = sub.take(self.heartbeat)
+                if deltas:
+                    yield f"event: delta\ndata: {json.dumps(deltas)}\n\n"
+                else:
+                    yield ": keep-alive\n\n"
+        finally:
+            self.unsubscribe(sub)
+
+    def _refresh_loop(self):
+        while True:
+            time.sleep(self.interval)
+            tickers = self.watched()
+            if not tickers:
+                continue
+            try:
+                self.refresh(tickers)
+            except Exception as e:
+                print(f"Error refreshing live tickers: {e}")
@@ -0,0 +1,294 @@
+#!/usr/bin/env python
+"""
+Load-testing harness for the Flask app (app.py).
+
+Starts the app on a local port with a stubbed data source in place of
+yfinance, drives a weighted mix of the real endpoints at a target request rate,
+and reports throughput, p50/p95/p99 latency and error rate per endpoint.
+
+Latency is measured from each request's scheduled send time. If the app or the
+client falls behind, the queueing delay shows up in the numbers and is not
+hidden.
+
+The app drops tickers whose upstream fetch fails and still answers 200, so
+injected failures (--error-rate) rarely show up as HTTP errors. The report
+therefore also counts upstream calls and the failures injected into them, per
+endpoint that triggered them.
+
+Examples:
+    python loadtest.py --rate 20 --duration 30
+    python loadtest.py --rate 50 --latency 0.3 --error-rate 0.05 --cache-ttl 0
+    python loadtest.py --mix index=1,top=1 --json
+"""
+import argparse
+import json
+import logging
+import math
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from flask import has_request_context, request
+from werkzeug.serving import make_server
+
+# Importing app runs its startup code. Without this, G2G_WARMUP would start a warm-up
+# against the real upstream before the stub is installed (--warmup runs it explicitly
+# once the stub is in place), and G2G_ALERT_* would send alerts for the stub's
+# synthetic price drift to a real webhook or mailbox
+for name in list(os.environ):
+    if name == 'G2G_WARMUP' or name.startswith('G2G_ALERT_'):
+        del os.environ[name]
+import app as g2g_app
+
+# Sent with each request so upstream calls can be attributed to the endpoint that made them
+ENDPOINT_HEADER = "X-Loadtest-Endpoint"
+
+# name -> (request builder returning (method, path, json body), default weight)
+ENDPOINTS = {
+    "index": (lambda rng: ("GET", "/", None), 2),
+    "analyze": (lambda rng: ("GET", "/api/analyze?tickers=" + ",".join(rng.sample(g2g_app.indian_universe, 3)), None), 3),
+    "add-stock": (lambda rng: ("POST", "/api/add-stock", {"ticker": rng.choice(g2g_app.indian_universe),
+                                                          "stocks_list": list(g2g_app.default_stocks)}), 1),
+    "suggestions": (lambda rng: ("GET", "/api/ticker-suggestions?q=" + rng.choice(g2g_app.indian_universe)[:rng.randint(1, 3)], None), 3),
+    "top": (lambda rng: ("GET", "/api/top-performers", None), 1),
+}
+
+
+class StubSource:
+    """Stands in for app.fetch_info with synthetic quotes, fixed latency and random failures.
+
+    calls and failures count upstream calls per endpoint name ("other" outside a load test request).
+    """
+
+    def __init__(self, latency=0.2, jitter=0.05, error_rate=0.0, seed=0):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.calls = Counter()
+        self.failures = Counter()
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def reset(self):
+        with self._lock:
+            self.calls.clear()
+            self.failures.clear()
+
+    def fetch_info(self, ticker):
+        endpoint = request.headers.get(ENDPOINT_HEADER, "other") if has_request_context() else "other"
+        with self._lock:
+            delay = max(0.0, self.latency + self._rng.uniform(-self.jitter, self.jitter))
+            fail = self._rng.random() < self.error_rate
+            drift = self._rng.uniform(0.98, 1.02)
+            self.calls[endpoint] += 1
+            if fail:
+                self.failures[endpoint] += 1
+        time.sleep(delay)
+        if fail:
+            raise ConnectionError(f"stubbed upstream error for {ticker}")
+
+        # Stable per-ticker fundamentals with a small price drift per fetch
+        base = random.Random(ticker)
+        low52 = base.uniform(100, 3000)
+        price = low52 * base.uniform(1.0, 1.6) * drift
+        eps = base.uniform(5, 150)
+        return {
+            "currentPrice": price,
+            "trailingPE": price / eps,
+            "trailingEps": eps,
+            "fiftyTwoWeekLow": low52,
+            "fiftyTwoWeekHigh": low52 * base.uniform(1.6, 2.2),
+            "priceToBook": base.uniform(0.5, 12),
+            "marketCap": base.uniform(1e10, 2e13),
+        }
+
+
+def parse_mix(spec):
+    if not spec:
+        return {name: weight for name, (_, weight) in ENDPOINTS.items()}
+    mix = {}
+    for part in spec.split(','):
+        name, _, weight = part.partition('=')
+        name = name.strip()
+        if name not in ENDPOINTS:
+            raise SystemExit(f"Unknown endpoint '{name}' (choose from {', '.join(ENDPOINTS)})")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return None
+    # Nearest-rank method
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def start_server(host, port):
+    server = make_server(host, port, g2g_app.app, threaded=True)
+    thread = threading.Thread(target=server.serve_forever, name="g2g-loadtest-server", daemon=True)
+    thread.start()
+    return server
+
+
+def run(base_url, mix, rate, duration, workers, seed=0):
+    """Fire requests at a fixed rate for duration seconds; returns ({name: [(latency, ok)]}, elapsed)"""
+    names = list(mix)
+    weights = [mix[n] for n in names]
+    rng = random.Random(seed)
+    local = threading.local()
+    samples = {name: [] for name in names}
+    samples_lock = threading.Lock()
+
+    def send(name, method, path, body, scheduled):
+        session = getattr(local, 'session', None)
+        if session is None:
+            session = local.session = requests.Session()
+        try:
+            response = session.request(method, base_url + path, json=body, timeout=60,
+                                       headers={"Accept-Encoding": "gzip", ENDPOINT_HEADER: name})
+            ok = response.status_code < 400
+        except requests.RequestException:
+            ok = False
+        latency = time.perf_counter() - scheduled
+        with samples_lock:
+            samples[name].append((latency, ok))
+
+    total = int(rate * duration)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for i in range(total):
+            scheduled = start + i / rate
+            wait = scheduled - time.perf_counter()
+            if wait > 0:
+                time.sleep(wait)
+            name = rng.choices(names, weights)[0]
+            method, path, body = ENDPOINTS[name][0](rng)
+            pool.submit(send, name, method, path, body, scheduled)
+    elapsed = time.perf_counter() - start
+    return samples, elapsed
+
+
+def summarize(samples, elapsed, upstream_calls=None, upstream_failures=None):
+    """Per-endpoint stats plus a TOTAL row; upstream counters are {endpoint: count} from StubSource"""
+    upstream_calls = upstream_calls or {}
+    upstream_failures = upstream_failures or {}
+    report = {}
+    everything = []
+    for name, rows in list(samples.items()) + [("TOTAL", None)]:
+        if rows is None:
+            rows = everything
+            calls = sum(upstream_calls.values())
+            failures = sum(upstream_failures.values())
+        else:
+            everything.extend(rows)
+            calls = upstream_calls.get(name, 0)
+            failures = upstream_failures.get(name, 0)
+        latencies = sorted(latency for latency, _ in rows)
+        errors = sum(1 for _, ok in rows if not ok)
+        report[name] = {
+            "requests": len(rows),
+            "errors": errors,
+            "error_rate": errors / len(rows) if rows else 0.0,
+            "throughput": len(rows) / elapsed if elapsed else 0.0,
+            "p50_ms": _ms(percentile(latencies, 50)),
+            "p95_ms": _ms(percentile(latencies, 95)),
+            "p99_ms": _ms(percentile(latencies, 99)),
+            "upstream_calls": calls,
+            "upstream_failures": failures,
+            "upstream_error_rate": failures / calls if calls else 0.0,
+        }
+    return report
+
+
+def _ms(seconds):
+    return round(seconds * 1000, 1) if seconds is not None else None
+
+
+def print_report(report, elapsed):
+    print(f"\nCompleted in {elapsed:.1f}s")
+    print("=" * 112)
+    print(f"{'Endpoint':<14}{'Requests':>10}{'Errors':>9}{'Err %':>8}{'Req/s':>9}{'p50 ms':>11}{'p95 ms':>11}{'p99 ms':>11}"
+          f"{'Upstream':>10}{'Failed':>9}{'Up err %':>10}")
+    print("-" * 112)
+    for name, row in report.items():
+        if name == "TOTAL":
+            print("-" * 112)
+        fmt = lambda v: f"{v:>11.1f}" if v is not None else f"{'-':>11}"
+        print(f"{name:<14}{row['requests']:>10}{row['errors']:>9}{row['error_rate'] * 100:>7.1f}%"
+              f"{row['throughput']:>9.1f}{fmt(row['p50_ms'])}{fmt(row['p95_ms'])}{fmt(row['p99_ms'])}"
+              f"{row['upstream_calls']:>10}{row['upstream_failures']:>9}{row['upstream_error_rate'] * 100:>9.1f}%")
+    print("=" * 112)
+    print("Upstream: stubbed fetches made while serving each endpoint; Failed: errors injected into them "
+          "(the app drops those tickers and still answers 200)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test the G2G Flask app against a stubbed data source")
+    parser.add_argument("--rate", type=float, default=10, help="target requests per second (default 10)")
+    parser.add_argument("--duration", type=float, default=30, help="seconds to run (default 30)")
+    parser.add_argument("--workers", type=int, default=64, help="max concurrent client requests (default 64)")
+    parser.add_argument("--mix", default="", help="endpoint weights, e.g. index=2,analyze=3,add-stock=1,suggestions=3,top=1")
+    parser.add_argument("--latency", type=float, default=0.2, help="stubbed upstream latency per ticker in seconds (default 0.2)")
+    parser.add_argument("--jitter", type=float, default=0.05, help="+/- random latency jitter in seconds (default 0.05)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of upstream calls that fail (default 0)")
+    parser.add_argument("--cache-ttl", type=float, default=None,
+                        help="override the app's score cache TTL in seconds; 0 makes every request hit the stub")
+    parser.add_argument("--warmup", action="store_true", help="run the app's startup warm-up and wait for it before driving load")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=0, help="port to serve on (default: any free port)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    parser.add_argument("--verbose", action="store_true", help="keep the app's own log output")
+    args = parser.parse_args(argv)
+
+    mix = parse_mix(args.mix)
+    stub = StubSource(args.latency, args.jitter, args.error_rate, args.seed)
+    g2g_app.fetch_info = stub.fetch_info
+    if args.cache_ttl is not None:
+        g2g_app.score_cache_ttl = args.cache_ttl
+
+    if not args.verbose:
+        logging.getLogger('werkzeug').setLevel(logging.ERROR)
+
+    if args.warmup:
+        g2g_app.start_warmup()
+        while g2g_app._warmup['state'] == "warming":
+            time.sleep(0.1)
+
+    # Only count upstream calls made while driving load
+    stub.reset()
+    server = start_server(args.host, args.port)
+    base_url = f"http://{args.host}:{server.port}"
+    print(f"Serving app on {base_url} with stubbed upstream "
+          f"(latency {args.latency}s ±{args.jitter}s, error rate {args.error_rate:.0%}, "
+          f"cache TTL {g2g_app.score_cache_ttl}s)")
+    print(f"Driving {args.rate:g} req/s for {args.duration:g}s, mix: "
+          + ", ".join(f"{name}={weight:g}" for name, weight in mix.items()))
+
+    # The app prints a line per failed analysis; keep that out of the report
+    stdout = sys.stdout
+    if not args.verbose:
+        sys.stdout = open(os.devnull, 'w')
+    try:
+        samples, elapsed = run(base_url, mix, args.rate, args.duration, args.workers, args.seed)
+    finally:
+        if sys.stdout is not stdout:
+            sys.stdout.close()
+            sys.stdout = stdout
+        server.shutdown()
+
+    report = summarize(samples, elapsed, stub.calls, stub.failures)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report, elapsed)
+
+
+if __name__ == '__main__':
+    main()
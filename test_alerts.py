@@ -0,0 +1,88 @@
+"""
+Tests for the alert engine in alerts.py, delivering to a LocalSink
+"""
+import pytest
+
+from alerts import AlertEngine, CrossesRule, LocalSink, RatingChangeRule, parse_rules
+from g2g_result import G2GResult
+
+
+def result(ticker, score):
+    return G2GResult(Ticker=ticker, G2G_Score=score)
+
+
+class CountingRule:
+    """Rule that never fires but records which tickers it was evaluated for"""
+
+    def __init__(self):
+        self.seen = []
+
+    def evaluate(self, ticker, old, new):
+        self.seen.append(ticker)
+        return None
+
+
+def delivered(engine, sink):
+    engine.wait()
+    return [n for batch in sink.batches for n in batch]
+
+
+def test_first_sighting_only_seeds_the_index():
+    sink = LocalSink()
+    engine = AlertEngine([CrossesRule(70), RatingChangeRule()], sink)
+
+    assert engine.on_results([result("TCS.NS", 100), result("INFY.NS", 10)]) == []
+    assert delivered(engine, sink) == []
+    assert engine.last("TCS.NS") == (100, "🟢 Perfect - Strong Buy")
+
+
+def test_crosses_fires_going_up_and_down():
+    sink = LocalSink()
+    engine = AlertEngine([CrossesRule(70)], sink)
+
+    engine.on_results([result("TCS.NS", 60)])
+    engine.on_results([result("TCS.NS", 70)])
+    engine.on_results([result("TCS.NS", 80)])
+    engine.on_results([result("TCS.NS", 40)])
+    messages = [n["message"] for n in delivered(engine, sink)]
+    assert messages == ["TCS.NS crossed above 70: 60 → 70", "TCS.NS fell below 70: 80 → 40"]
+
+
+def test_rating_change_fires():
+    sink = LocalSink()
+    engine = AlertEngine([RatingChangeRule()], sink)
+
+    engine.on_results([result("TCS.NS", 50)])
+    engine.on_results([result("TCS.NS", 55)])
+    engine.on_results([result("TCS.NS", 75)])
+    (alert,) = delivered(engine, sink)
+    assert (alert["old_rating"], alert["new_rating"]) == ("🟠 Moderate - Hold", "🟡 Very Good - Watchlist")
+    assert (alert["old_score"], alert["new_score"]) == (55, 75)
+
+
+def test_batches_are_split_by_batch_size():
+    sink = LocalSink()
+    engine = AlertEngine([RatingChangeRule()], sink, batch_size=2)
+    tickers = [f"T{i}.NS" for i in range(5)]
+
+    engine.on_results([result(t, 10) for t in tickers])
+    assert len(engine.on_results([result(t, 100) for t in tickers])) == 5
+    engine.wait()
+    assert [len(batch) for batch in sink.batches] == [2, 2, 1]
+
+
+def test_unchanged_score_and_rating_skip_the_rules():
+    rule = CountingRule()
+    engine = AlertEngine([rule], LocalSink())
+
+    engine.on_results([result("TCS.NS", 50), result("INFY.NS", 50)])
+    engine.on_results([result("TCS.NS", 50), result("INFY.NS", 60)])
+    assert rule.seen == ["INFY.NS"]
+
+
+def test_parse_rules():
+    rules = parse_rules("crosses:70, rating,,crosses:40")
+    assert [type(r) for r in rules] == [CrossesRule, RatingChangeRule, CrossesRule]
+    assert rules[2].threshold == 40
+    with pytest.raises(ValueError, match="Unknown alert rule"):
+        parse_rules("crosses:70,moon")
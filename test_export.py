@@ -0,0 +1,102 @@
+"""
+Tests for the streaming export (export.py and /api/export in app.py), run against a stubbed fetch_info
+"""
+import csv
+import io
+
+import pytest
+
+import app as g2g_app
+import export
+
+TICKERS = ["TCS.NS", "INFY.NS", "WIPRO.NS", "HCLTECH.NS", "ZZZ.NS"]
+
+
+def fetch_info(ticker):
+    if ticker == "ZZZ.NS":
+        raise ConnectionError("unknown ticker")
+    base = len(ticker)
+    info = {
+        "currentPrice": 100.0 + base,
+        "trailingPE": 8.0 + base,
+        "trailingEps": 2.5,
+        "fiftyTwoWeekLow": 90.0,
+        "fiftyTwoWeekHigh": 150.0,
+        "marketCap": 1e10,
+    }
+    # One ticker without a price-to-book ratio, to round-trip a missing value
+    if ticker != "INFY.NS":
+        info["priceToBook"] = 1.5
+    return info
+
+
+@pytest.fixture
+def client(monkeypatch):
+    for name in ("_score_cache", "_score_versions", "_failed_at"):
+        monkeypatch.setattr(g2g_app, name, {})
+    monkeypatch.setattr(g2g_app, "score_listeners", [])
+    monkeypatch.setattr(g2g_app, "fetch_info", fetch_info)
+    return g2g_app.app.test_client()
+
+
+def test_csv_sends_header_first_then_one_chunk_per_scored_chunk(client):
+    scored = []
+
+    def score(chunk):
+        scored.append(chunk)
+        return g2g_app.score_for_export(chunk)
+
+    parts = list(export.write_csv(export.scored_rows(TICKERS, score, chunk_size=2)))
+    assert parts[0] == (",".join(export.EXPORT_FIELDS) + "\r\n").encode()
+    assert len(parts) == 1 + len(scored) == 4
+    rows = list(csv.DictReader(io.StringIO(b"".join(parts).decode())))
+    assert [row["Ticker"] for row in rows] == TICKERS[:4]
+
+
+def test_parquet_writes_one_row_group_per_chunk(client):
+    pq = pytest.importorskip("pyarrow.parquet")
+    data = b"".join(export.write_parquet(export.scored_rows(TICKERS[:4], g2g_app.score_for_export, chunk_size=3)))
+
+    parquet = pq.ParquetFile(io.BytesIO(data))
+    assert parquet.metadata.num_row_groups == 2
+    assert parquet.schema_arrow.names == list(export.EXPORT_FIELDS)
+    assert parquet.read().column("Ticker").to_pylist() == TICKERS[:4]
+
+
+def test_from_csv_round_trips_types(client, tmp_path):
+    path = tmp_path / "scores.csv"
+    export.main(["--tickers", ",".join(TICKERS), "--out", str(path), "--chunk-size", "2"])
+
+    expected = [row for chunk in export.scored_rows(TICKERS, g2g_app.score_for_export) for row in chunk]
+    rows = [row for chunk in export.csv_rows(str(path), chunk_size=2) for row in chunk]
+    assert rows == expected
+    assert [type(value) for value in rows[0]] == [type(value) for value in expected[0]]
+    infy = dict(zip(export.EXPORT_FIELDS, rows[1]))
+    assert infy["PB_Ratio"] is None
+    assert isinstance(infy["G2G_Score"], int) and isinstance(infy["PE"], float)
+
+
+def test_export_rejects_unknown_and_unavailable_formats(client, monkeypatch):
+    assert client.get("/api/export?tickers=TCS.NS&format=pdf").status_code == 400
+
+    monkeypatch.setattr(export, "pa", None)
+    monkeypatch.setattr(export, "Workbook", None)
+    assert client.get("/api/export?tickers=TCS.NS&format=parquet").status_code == 501
+    assert client.get("/api/export?tickers=TCS.NS&format=xlsx").status_code == 501
+
+
+def test_export_does_not_grow_the_score_cache(client):
+    response = client.get("/api/export?tickers=" + ",".join(TICKERS) + "&format=csv")
+    assert response.status_code == 200
+    assert len(response.get_data().decode().splitlines()) == 5
+    assert g2g_app._score_cache == {}
+
+
+def test_export_reuses_fresh_cache_entries(client, monkeypatch):
+    g2g_app.score_tickers(["TCS.NS"])
+    calls = []
+    monkeypatch.setattr(g2g_app, "fetch_info", lambda ticker: calls.append(ticker) or fetch_info(ticker))
+
+    g2g_app.score_for_export(["TCS.NS", "INFY.NS"])
+    assert calls == ["INFY.NS"]
+    assert list(g2g_app._score_cache) == ["TCS.NS"]
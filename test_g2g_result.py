@@ -0,0 +1,133 @@
+"""
+Tests for the G2GResult record and the columnar response format in g2g_result.py
+"""
+import pytest
+
+from g2g_result import CONSTANTS, COLUMNAR_FIELDS, ROW_FIELDS, G2GResult, to_columnar
+
+
+def make(**values):
+    fields = dict(Ticker="TCS.NS", Price=110.0, PE=12.0, EPS_Final=9.0, PEG=0.5, Low52=100.0, High52=150.0,
+                  Price_to_Low_Ratio=1.1, PB_Ratio=2.0, Market_Cap=1e10,
+                  PE_Score=30, PEG_Score=30, Underval_Score=40, G2G_Score=100)
+    fields.update(values)
+    return G2GResult(**fields)
+
+
+def test_to_dict_matches_the_original_row():
+    assert make().to_dict() == {
+        "Ticker": "TCS.NS", "Price": 110.0, "PE": 12.0, "PE_Threshold": 15,
+        "PE_Status": "✅ Good (PE: 12.00)", "EPS_Final": 9.0,
+        "PEG": 0.5, "PEG_Threshold": 1.0, "PEG_Status": "✅ Growth-Adjusted (0.500)",
+        "Low52": 100.0, "High52": 150.0,
+        "Price_to_Low_Ratio": 1.1, "Underval_Status": "✅ Undervalued (1.10x)",
+        "PB_Ratio": 2.0, "Market_Cap": 1e10,
+        "PE_Score": 30, "PE_Score_Max": 30, "PEG_Score": 30, "PEG_Score_Max": 30,
+        "Underval_Score": 40, "Underval_Score_Max": 40, "G2G_Score": 100, "G2G_Max": 100,
+        "Rating": "🟢 Perfect - Strong Buy",
+    }
+    assert list(make().to_dict()) == list(ROW_FIELDS)
+    assert list(make(Sector="IT & Technology").to_dict()) == list(ROW_FIELDS) + ["Sector"]
+
+
+@pytest.mark.parametrize("pe, status", [
+    (14.99, "✅ Good (PE: 14.99)"),
+    (15, "❌ Expensive (PE: 15.00)"),
+    (15.01, "❌ Expensive (PE: 15.01)"),
+    (0, "⚠️ No Data"),
+    (None, "⚠️ No Data"),
+])
+def test_pe_status_around_threshold(pe, status):
+    assert make(PE=pe).to_dict()["PE_Status"] == status
+
+
+@pytest.mark.parametrize("peg, status", [
+    (0.999, "✅ Growth-Adjusted (0.999)"),
+    (1.0, "❌ Overvalued (1.000)"),
+    (1.5, "❌ Overvalued (1.500)"),
+    (None, "⚠️ Cannot Calculate"),
+])
+def test_peg_status_around_threshold(peg, status):
+    assert make(PEG=peg).to_dict()["PEG_Status"] == status
+
+
+@pytest.mark.parametrize("price, ratio, status", [
+    (119.99, 1.1999, "✅ Undervalued (1.20x)"),
+    (120.0, 1.2, "❌ High (1.20x)"),
+    (130.0, 1.3, "❌ High (1.30x)"),
+    (110.0, None, "⚠️ No Data"),
+])
+def test_underval_status_around_threshold(price, ratio, status):
+    assert make(Price=price, Price_to_Low_Ratio=ratio).to_dict()["Underval_Status"] == status
+
+
+@pytest.mark.parametrize("score, rating", [
+    (100, "🟢 Perfect - Strong Buy"),
+    (70, "🟡 Very Good - Watchlist"),
+    (69, "🟠 Moderate - Hold"),
+    (40, "🟠 Moderate - Hold"),
+    (30, "🔴 Poor - Avoid"),
+    (0, "❌ Very Poor - Avoid"),
+])
+def test_rating(score, rating):
+    assert make(G2G_Score=score)["Rating"] == rating
+
+
+def test_dict_style_access():
+    result = make()
+    result["Sector"] = "IT & Technology"
+    result["Scoring_Mode"] = "sector"
+    assert (result["PE_Threshold"], result["Sector"], result.get("Scoring_Mode")) == (15, "IT & Technology", "sector")
+    assert result.get("missing", "default") == "default"
+    with pytest.raises(KeyError):
+        result["Rating"] = "🟢 Perfect - Strong Buy"
+    result["PE_Status"] = "✅ Below sector median (PE 12.00 vs 20.00)"
+    assert result.to_dict()["PE_Status"] == "✅ Below sector median (PE 12.00 vs 20.00)"
+
+
+def test_copy_is_equal_and_independent():
+    original = make(Sector="IT & Technology", Sector_Peers=3)
+    copy = original.copy()
+    assert copy == original and copy is not original
+
+    copy["G2G_Score"] = 70
+    copy["Sector_Peers"] = 4
+    assert (original["G2G_Score"], original["Sector_Peers"]) == (100, 3)
+    assert copy != original
+
+
+def test_equality_drives_cache_versioning():
+    # cached_score bumps a ticker's version whenever the new result != the cached one
+    assert make() == make()
+    assert make(Price=110.01) != make()
+    assert make(Sector="Banking & Finance") != make(Sector="IT & Technology")
+    assert make(Note="x") != make()
+    assert make() != make().to_dict()
+    with pytest.raises(TypeError):
+        hash(make())
+
+
+def test_columnar_shape():
+    results = [make(), make(Ticker="INFY.NS", PE=None, G2G_Score=70, Sector_Peers=3)]
+    table = to_columnar(results)
+
+    assert table["format"] == "columnar"
+    assert table["constants"] == CONSTANTS
+    assert table["count"] == 2
+    columns = table["columns"]
+    assert list(columns)[:len(COLUMNAR_FIELDS)] == list(COLUMNAR_FIELDS)
+    assert all(len(values) == 2 for values in columns.values())
+    assert columns["Ticker"] == ["TCS.NS", "INFY.NS"]
+    assert columns["PE"] == [12.0, None]
+    assert columns["Rating"] == ["🟢 Perfect - Strong Buy", "🟡 Very Good - Watchlist"]
+    assert columns["Sector_Peers"] == [None, 3]
+    assert not set(CONSTANTS) & set(columns)
+    assert "PE_Status" not in columns
+
+
+def test_columnar_sends_overridden_status_columns():
+    results = [make(), make(Ticker="INFY.NS", PE=20.0)]
+    results[0]["PE_Status"] = "✅ Below sector median (PE 12.00 vs 16.00)"
+    columns = to_columnar(results)["columns"]
+    assert columns["PE_Status"] == ["✅ Below sector median (PE 12.00 vs 16.00)", "❌ Expensive (PE: 20.00)"]
+    assert "PEG_Status" not in columns and "Underval_Status" not in columns
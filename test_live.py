@@ -0,0 +1,57 @@
+"""
+Tests for the live delta hub in live.py
+"""
+import pytest
+
+from g2g_result import G2GResult
+from live import LIVE_FIELDS, LiveHub
+
+
+def result(ticker, price=110.0, g2g_score=70):
+    return G2GResult(Ticker=ticker, Price=price, PE=12.0, EPS_Final=9.0, PEG=0.5, Low52=100.0, High52=150.0,
+                     Price_to_Low_Ratio=1.1, PE_Score=30, PEG_Score=30, Underval_Score=10, G2G_Score=g2g_score)
+
+
+@pytest.fixture
+def hub():
+    # The refresh thread started by subscribe() never gets to run within a test
+    return LiveHub(lambda tickers: None, interval=3600)
+
+
+def test_only_changed_fields_of_watched_tickers_are_pushed(hub):
+    sub = hub.subscribe(["TCS.NS", "INFY.NS"])
+    hub.on_results([result("TCS.NS"), result("INFY.NS"), result("WIPRO.NS")])
+    first = {d["Ticker"]: d for d in sub.take(0)}
+    assert sorted(first) == ["INFY.NS", "TCS.NS"]
+    assert set(first["TCS.NS"]) == set(LIVE_FIELDS) | {"Ticker"}
+
+    hub.on_results([result("TCS.NS", price=111.0), result("INFY.NS"), result("WIPRO.NS", price=200.0)])
+    assert sub.take(0) == [{"Price": 111.0, "Ticker": "TCS.NS"}]
+
+
+def test_slow_subscriber_gets_one_merged_delta_per_ticker(hub):
+    sub = hub.subscribe(["TCS.NS"])
+    hub.on_results([result("TCS.NS")])
+    sub.take(0)
+
+    hub.on_results([result("TCS.NS", price=111.0)])
+    hub.on_results([result("TCS.NS", price=112.0, g2g_score=100)])
+    hub.on_results([result("TCS.NS", price=113.0, g2g_score=100)])
+    assert sub.take(0) == [{"Price": 113.0, "Ticker": "TCS.NS", "G2G_Score": 100,
+                            "Rating": "🟢 Perfect - Strong Buy"}]
+    assert sub.take(0) == []
+
+
+def test_unsubscribe_removes_empty_watcher_sets(hub):
+    first = hub.subscribe(["TCS.NS", "INFY.NS"])
+    second = hub.subscribe(["TCS.NS"])
+    assert sorted(hub.watched()) == ["INFY.NS", "TCS.NS"]
+
+    hub.unsubscribe(first)
+    assert hub.watched() == ["TCS.NS"]
+    hub.unsubscribe(second)
+    assert hub.watched() == []
+    assert hub._by_ticker == {}
+
+    hub.on_results([result("TCS.NS")])
+    assert first.take(0) == [] and second.take(0) == []
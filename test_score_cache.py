@@ -0,0 +1,165 @@
+"""
+Tests for the score cache and ETag handling in app.py, run against a stubbed fetch_info
+"""
+import time
+
+import pytest
+
+import app as g2g_app
+
+QUOTE = {
+    "currentPrice": 100.0,
+    "trailingPE": 12.0,
+    "trailingEps": 8.0,
+    "fiftyTwoWeekLow": 90.0,
+    "fiftyTwoWeekHigh": 150.0,
+    "priceToBook": 2.0,
+    "marketCap": 1e10,
+}
+
+
+class FlakyUpstream:
+    """fetch_info stand-in that raises for the first `failures` calls"""
+
+    def __init__(self, failures=0):
+        self.failures = failures
+        self.calls = 0
+
+    def fetch_info(self, ticker):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise ConnectionError("upstream down")
+        return dict(QUOTE)
+
+
+@pytest.fixture
+def client(monkeypatch):
+    for name in ("_score_cache", "_score_versions", "_failed_at"):
+        monkeypatch.setattr(g2g_app, name, {})
+    monkeypatch.setattr(g2g_app, "score_listeners", [])
+    monkeypatch.setattr(g2g_app, "score_cache_ttl", 300)
+    return g2g_app.app.test_client()
+
+
+def analyze(client, **headers):
+    return client.get("/api/analyze?tickers=TCS.NS", headers=headers)
+
+
+def test_failed_fetch_is_retried_once_upstream_recovers(client, monkeypatch):
+    upstream = FlakyUpstream(failures=1)
+    monkeypatch.setattr(g2g_app, "fetch_info", upstream.fetch_info)
+    monkeypatch.setattr(g2g_app, "failure_retry_ttl", 0)
+
+    assert analyze(client).get_json() == []
+    response = analyze(client)
+    assert [row["Ticker"] for row in response.get_json()] == ["TCS.NS"]
+    assert upstream.calls == 2
+
+
+def test_failed_fetch_is_not_retried_within_failure_ttl(client, monkeypatch):
+    upstream = FlakyUpstream(failures=1)
+    monkeypatch.setattr(g2g_app, "fetch_info", upstream.fetch_info)
+    monkeypatch.setattr(g2g_app, "failure_retry_ttl", 60)
+
+    assert analyze(client).get_json() == []
+    assert analyze(client).get_json() == []
+    assert upstream.calls == 1
+
+
+def test_missing_data_never_gets_304(client, monkeypatch):
+    monkeypatch.setattr(g2g_app, "fetch_info", FlakyUpstream(failures=2).fetch_info)
+    monkeypatch.setattr(g2g_app, "failure_retry_ttl", 0)
+
+    first = analyze(client)
+    assert first.status_code == 200
+    assert analyze(client, **{"If-None-Match": first.headers["ETag"]}).status_code == 200
+
+
+def test_conditional_get_returns_304_while_data_is_fresh(client, monkeypatch):
+    upstream = FlakyUpstream()
+    monkeypatch.setattr(g2g_app, "fetch_info", upstream.fetch_info)
+
+    first = analyze(client)
+    etag = first.headers["ETag"]
+    again = analyze(client, **{"If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.headers["ETag"] == etag
+    assert upstream.calls == 1
+
+
+def test_stale_result_is_kept_when_refresh_fails(client, monkeypatch):
+    upstream = FlakyUpstream()
+    monkeypatch.setattr(g2g_app, "fetch_info", upstream.fetch_info)
+    assert len(analyze(client).get_json()) == 1
+
+    monkeypatch.setattr(g2g_app, "score_cache_ttl", 0)
+    upstream.failures = upstream.calls + 1
+    assert [row["Ticker"] for row in analyze(client).get_json()] == ["TCS.NS"]
+
+
+def test_forced_refresh_refetches_fresh_entries(client, monkeypatch):
+    upstream = FlakyUpstream()
+    monkeypatch.setattr(g2g_app, "fetch_info", upstream.fetch_info)
+
+    g2g_app.score_tickers(["TCS.NS"])
+    g2g_app.score_tickers(["TCS.NS"])
+    assert upstream.calls == 1
+    g2g_app.score_tickers(["TCS.NS"], force=True)
+    assert upstream.calls == 2
+
+
+def wait_for_warmup(client, timeout=5):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        response = client.get("/api/ready")
+        if response.status_code == 200:
+            return response.get_json()
+        time.sleep(0.01)
+    raise AssertionError("warm-up never finished")
+
+
+@pytest.fixture
+def warmup(monkeypatch):
+    monkeypatch.setattr(g2g_app, "_warmup", dict(g2g_app._warmup, state="disabled"))
+    monkeypatch.setattr(g2g_app, "default_stocks", ["TCS.NS"])
+    monkeypatch.setattr(g2g_app, "indian_universe", ["TCS.NS", "INFY.NS"])
+    monkeypatch.setattr(g2g_app, "warmup_retry_delay", 0)
+
+
+def test_warmup_retries_and_reports_failed_tickers(client, monkeypatch, warmup):
+    upstream = FlakyUpstream(failures=1)
+
+    def fetch_info(ticker):
+        if ticker == "INFY.NS":
+            raise ConnectionError("upstream down")
+        return upstream.fetch_info(ticker)
+
+    monkeypatch.setattr(g2g_app, "fetch_info", fetch_info)
+    g2g_app.start_warmup(concurrency=1)
+    status = wait_for_warmup(client)
+    assert status["state"] == "ready"
+    assert (status["done"], status["total"], status["failed"]) == (1, 2, ["INFY.NS"])
+
+
+def test_warmup_crash_still_finishes(client, monkeypatch, warmup):
+    def crash(tickers, force=False):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(g2g_app, "score_tickers", crash)
+    g2g_app.start_warmup()
+    status = wait_for_warmup(client)
+    assert status["state"] == "failed"
+    assert status["finished"] is not None
+
+
+def test_head_matches_compressed_get(client, monkeypatch):
+    monkeypatch.setattr(g2g_app, "fetch_info", FlakyUpstream().fetch_info)
+    url = "/api/analyze?tickers=TCS.NS,INFY.NS,WIPRO.NS"
+    headers = {"Accept-Encoding": "gzip"}
+
+    get = client.get(url, headers=headers)
+    head = client.head(url, headers=headers)
+    assert get.headers["Content-Encoding"] == head.headers["Content-Encoding"] == "gzip"
+    assert int(head.headers["Content-Length"]) == int(get.headers["Content-Length"]) == len(get.get_data())
+    assert head.headers["ETag"] == get.headers["ETag"]
+    assert head.get_data() == b""
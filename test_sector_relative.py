@@ -0,0 +1,106 @@
+"""
+Tests for sector-relative scoring (apply_sector_relative / ?mode=sector) in app.py, run against a stubbed fetch_info
+"""
+import pandas as pd
+import pytest
+
+import app as g2g_app
+
+# Alpha has three scored peers for every metric (A4 has no data at all);
+# Beta has only two, so it keeps the absolute scores.
+QUOTES = {
+    "A1": {"currentPrice": 110.0, "trailingPE": 10.0, "trailingEps": 1.0, "fiftyTwoWeekLow": 100.0},
+    "A2": {"currentPrice": 115.0, "trailingPE": 14.0, "trailingEps": 1.0, "fiftyTwoWeekLow": 100.0},
+    "A3": {"currentPrice": 130.0, "trailingPE": 12.0, "trailingEps": 2.0, "fiftyTwoWeekLow": 100.0},
+    "A4": {"currentPrice": 100.0},
+    "B1": {"currentPrice": 100.0, "trailingPE": 10.0, "trailingEps": 10.0, "fiftyTwoWeekLow": 90.0},
+    "B2": {"currentPrice": 100.0, "trailingPE": 30.0, "trailingEps": 1.0, "fiftyTwoWeekLow": 50.0},
+}
+SECTORS = {"A1": "Alpha", "A2": "Alpha", "A3": "Alpha", "A4": "Alpha", "B1": "Beta", "B2": "Beta"}
+
+
+@pytest.fixture
+def client(monkeypatch):
+    for name in ("_score_cache", "_score_versions", "_failed_at"):
+        monkeypatch.setattr(g2g_app, name, {})
+    monkeypatch.setattr(g2g_app, "score_listeners", [])
+    monkeypatch.setattr(g2g_app, "fetch_info", lambda ticker: dict(QUOTES[ticker]))
+    monkeypatch.setattr(g2g_app, "sector_index", pd.Series(SECTORS, name="Sector"))
+    monkeypatch.setattr(g2g_app, "indian_universe", list(SECTORS))
+    return g2g_app.app.test_client()
+
+
+@pytest.fixture
+def scored(client):
+    absolute = {r['Ticker']: r for r in g2g_app.score_tickers(list(QUOTES))}
+    relative = {r['Ticker']: r for r in g2g_app.apply_sector_relative(list(absolute.values()))}
+    return absolute, relative
+
+
+def test_sector_medians_and_percentiles(scored):
+    _, relative = scored
+    a1 = relative["A1"]
+    assert (a1["PE_Sector_Median"], a1["PEG_Sector_Median"], a1["Price_to_Low_Ratio_Sector_Median"]) \
+        == pytest.approx((12.0, 2.0, 1.15))
+    assert [relative[t]["PE_Sector_Pctile"] for t in ("A1", "A3", "A2")] == pytest.approx([1 / 3, 2 / 3, 1.0])
+    assert relative["A4"]["PE_Sector_Pctile"] is None
+    assert relative["A1"]["Sector_Peers"] == 3
+    assert relative["B1"]["PE_Sector_Median"] == pytest.approx(20.0)
+
+
+def test_small_sector_keeps_absolute_scores_and_statuses(scored):
+    absolute, relative = scored
+    for ticker in ("B1", "B2"):
+        for field in ("PE_Score", "PEG_Score", "Underval_Score", "G2G_Score",
+                      "PE_Status", "PEG_Status", "Underval_Status"):
+            assert relative[ticker][field] == absolute[ticker][field], (ticker, field)
+    assert relative["B1"]["PE_Status"] == "✅ Good (PE: 10.00)"
+    assert relative["B1"]["G2G_Score"] == 100
+    assert relative["B2"]["Sector_Peers"] == 2
+
+
+def test_value_equal_to_median_scores_zero(scored):
+    _, relative = scored
+    assert relative["A3"]["PE_Score"] == 0
+    assert relative["A3"]["PE_Status"] == "❌ Not below sector median (PE 12.00 vs 12.00)"
+    assert relative["A1"]["PEG_Score"] == 0
+    assert relative["A2"]["Underval_Score"] == 0
+
+
+def test_statuses_follow_relative_scores(scored):
+    absolute, relative = scored
+    # Absolutely overvalued (PEG >= 1) but the cheapest in its sector
+    assert absolute["A3"]["PEG_Status"] == "❌ Overvalued (1.200)"
+    assert relative["A3"]["PEG_Score"] == 30
+    assert relative["A3"]["PEG_Status"] == "✅ Below sector median (PEG 1.200 vs 2.000)"
+    assert relative["A2"]["PE_Score"] == 0
+    assert relative["A2"]["PE_Status"] == "❌ Not below sector median (PE 14.00 vs 12.00)"
+    assert relative["A1"]["Underval_Status"] == "✅ Below sector median (Price/52W low 1.10x vs 1.15x)"
+
+
+def test_missing_metric_scores_zero_with_no_data(scored):
+    _, relative = scored
+    a4 = relative["A4"]
+    assert (a4["PE_Score"], a4["PEG_Score"], a4["Underval_Score"], a4["G2G_Score"]) == (0, 0, 0, 0)
+    assert a4["PE_Status"] == a4["PEG_Status"] == a4["Underval_Status"] == "⚠️ No Data"
+
+
+def test_g2g_score_and_rating_are_recomputed(scored):
+    absolute, relative = scored
+    assert [absolute[t]["G2G_Score"] for t in ("A1", "A2", "A3")] == [70, 70, 30]
+    assert [relative[t]["G2G_Score"] for t in ("A1", "A2", "A3")] == [70, 0, 30]
+    assert absolute["A2"]["Rating"] == "🟡 Very Good - Watchlist"
+    assert relative["A2"]["Rating"] == "❌ Very Poor - Avoid"
+    assert relative["A2"]["Scoring_Mode"] == "sector"
+    # The shared cached results are left untouched
+    assert absolute["A2"]["G2G_Score"] == 70 and "Scoring_Mode" not in absolute["A2"].to_dict()
+
+
+def test_sector_leaders_rank_by_relative_score(client):
+    leaders = client.get("/api/sector-leaders").get_json()
+    assert [r["Ticker"] for r in leaders["Alpha"]] == ["A1", "A2", "A3"]
+
+    leaders = client.get("/api/sector-leaders?mode=sector").get_json()
+    assert [(r["Ticker"], r["G2G_Score"]) for r in leaders["Alpha"]] == [("A1", 70), ("A3", 30), ("A2", 0)]
+    assert [r["Ticker"] for r in leaders["Beta"]] == ["B1", "B2"]
+    assert all(r["Scoring_Mode"] == "sector" for r in leaders["Alpha"])